@@ -1,10 +1,86 @@
+import contextlib
 import enum
+import functools
+import os
 from typing import Any
-from pymediainfo import MediaInfo
-import moviepy.editor as mp
-from pydub import AudioSegment, silence
-import matplotlib.pyplot as plt
-from media.utils import validators
+from pymediainfo import MediaInfo, Track
+import numpy as np
+from media.utils import validators, silence, ffmpeg, transcode
+
+# Longest supported media duration in milliseconds (100 hours).
+MAX_DURATION_MS = 360_000_000
+
+# Descriptors per (attribute name, descriptor type, kwargs), shared by all classes using the same
+# metadata. The name is part of the key, as a descriptor stores its value under its own name.
+_VALIDATOR_INTERN: dict[tuple[str, type, frozenset], validators.BaseValidator] = {}
+
+# Prefixes of Metadata names per MediaInfo track type.
+_TRACK_PREFIX = {
+    'General': 'general_',
+    'Video': 'video_',
+    'Audio': 'audio_',
+    'Text': 'text_',
+    'Image': 'image_',
+    'Menu': 'menu_',
+    'Other': 'other_'
+}
+
+# NumPy types of the samples in an AudioSegment per sample width in bytes.
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# Sample rate audio is decoded at for silence detection, a whole number of samples per millisecond.
+_DECODE_RATE = 48000
+
+
+def _file_key(file:str) -> tuple[str, int, int]:
+    """Identify the current version of a file by its absolute path, modification time and size."""
+    path = os.path.abspath(file)
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_tracks(file_key:tuple[str, int, int]) -> dict[str, Track]:
+    """Parse the tracks of a media file with MediaInfo.
+
+    Results are cached per file version (see _file_key), so inspecting the same file again, e.g. from
+    another Media object, does not run MediaInfo again. The cache is bounded, so long-running batch
+    jobs over many files do not keep the metadata of every file alive.
+
+    Returns:
+        dict[str, Track]: The tracks per track type. Fields are read from them as attributes, so no
+            dicts of all fields have to be built with Track.to_data.
+    """
+    return {track.track_type: track for track in MediaInfo.parse(file_key[0]).tracks}
+
+
+@functools.lru_cache(maxsize=128)
+def _compute_sound_intervals(file_key:tuple[str, int, int], min_sound_len:int, min_silence_len:int, silence_thresh:int, seek_step:int) -> tuple[tuple[int, int], ...]:
+    """Calculate intervals in milliseconds where sound is present in an audio file.
+
+    The audio is streamed from ffmpeg as mono 16-bit samples, so only the energy per millisecond has to
+    fit in memory. If ffmpeg is not available, the whole file is decoded by pydub instead.
+    Results are cached across Audio objects per file version (see _file_key) and arguments.
+
+    Returns:
+        tuple[tuple[int, int], ...]: Intervals in milliseconds where sound is present.
+    """
+    if ffmpeg.available():
+        # Closing the stream right away stops ffmpeg even if detection is interrupted, instead of
+        # leaving it blocked on a full pipe until the generator is garbage collected.
+        with contextlib.closing(ffmpeg.stream_pcm(file_key[0], _DECODE_RATE)) as chunks:
+            intervals = silence.detect_nonsilent_stream(chunks, _DECODE_RATE, 2 ** 15, min_silence_len, silence_thresh, seek_step, min_sound_len)
+        return tuple(map(tuple, intervals))
+
+    from pydub import AudioSegment
+    segment = AudioSegment.from_file(file_key[0])
+    # View the decoded bytes without copying, and only allocate when channels have to be mixed down.
+    samples = np.frombuffer(segment.raw_data, dtype=_SAMPLE_DTYPES[segment.sample_width])
+    if segment.channels > 1:
+        samples = samples.reshape(-1, segment.channels).mean(axis=1, dtype=np.float32)
+    intervals = silence.detect_nonsilent(samples, segment.frame_rate, segment.max_possible_amplitude, min_silence_len, silence_thresh, seek_step, min_sound_len=min_sound_len)
+    return tuple(map(tuple, intervals))
+
 
 class Metadata(enum.Enum):
     """Enumeration containing supported types of metadata and their appropriate data descriptors."""
@@ -24,7 +100,11 @@ class Metadata(enum.Enum):
         obj = object.__new__(cls)
         obj._value_ = name
         obj.descriptor = descriptor
+        # A frozenset makes the kwargs hashable and checking characters against it O(1).
+        if 'valid_characters' in kwargs:
+            kwargs = {**kwargs, 'valid_characters': frozenset(kwargs['valid_characters'])}
         obj.kwargs = kwargs
+        obj._build_descriptor = functools.partial(descriptor, **kwargs) if kwargs else descriptor
         return obj
 
     file_name = 'file_name', validators.StringValidator, {
@@ -43,7 +123,7 @@ class Metadata(enum.Enum):
 
     duration = 'duration', validators.IntValidator, {
         'min_value': 1, 
-        'max_value': 360000000
+        'max_value': MAX_DURATION_MS
     }
     general_duration = 'duration'
 
@@ -56,19 +136,42 @@ class Metadata(enum.Enum):
     general_file_creation_date = 'date_created'
 
 
+# Metadata that is derived from the path of a file rather than read by MediaInfo.
+_PATH_METADATA = (Metadata.file_name, Metadata.extension)
+
+
 class MediaType(type):
     """Metaclass for Media (sub)classes.
     
     For each Metadata in the class 'metadata' attribute, create a new data descriptor attribute
-    using the descriptor type and arguments as specified in the Metadata enum.
+    using the descriptor type and arguments as specified in the Metadata enum. Also store which
+    MediaInfo properties to read for that metadata in '_metadata_by_track', as a mapping from track
+    type to (property, Metadata) pairs, based on the names of the Metadata aliases.
+
+    Classes that define 'metadata' get slots for the values of the descriptors added to their
+    '__slots__'. Other classes are left as they are, so their instances keep a __dict__.
     """
     def __new__(mcls, name, bases, cls_dict):
+        if 'metadata' in cls_dict:
+            storage = tuple(validators.BaseValidator.storage_name(prop.name) for prop in cls_dict['metadata'])
+            storage = tuple(slot for slot in storage if not any(hasattr(base, slot) for base in bases))
+            cls_dict['__slots__'] = tuple(cls_dict.get('__slots__', ())) + storage
         cls = super().__new__(mcls, name, bases, cls_dict)
-        if hasattr(cls, 'metadata'):
+        if 'metadata' in cls_dict:
             for prop in cls.metadata:
-                descriptor = prop.descriptor(**prop.kwargs)
+                key = (prop.name, prop.descriptor, frozenset(prop.kwargs.items()))
+                if key not in _VALIDATOR_INTERN:
+                    _VALIDATOR_INTERN[key] = prop._build_descriptor()
+                descriptor = _VALIDATOR_INTERN[key]
                 descriptor.__set_name__(cls, prop.name)
                 setattr(cls, prop.name, descriptor)
+            metadata_by_track = {}
+            for name, prop in Metadata.__members__.items():
+                if prop in cls.metadata and prop not in _PATH_METADATA:
+                    for track_type, prefix in _TRACK_PREFIX.items():
+                        if name.startswith(prefix):
+                            metadata_by_track.setdefault(track_type, []).append((name[len(prefix):], prop))
+            cls._metadata_by_track = {track_type: tuple(fields) for track_type, fields in metadata_by_track.items()}
         return cls
 
 
@@ -77,11 +180,16 @@ class Media(metaclass=MediaType):
     
     Args:
         file (str): File name (+ path).
+
+    Attributes:
+        metadata (tuple[Metadata]): The types of supported metadata, none for plain media files.
     """
+    __slots__ = ('_file',)
+    metadata = ()
+
     def __init__(self, file:str) -> None:
-        if hasattr(self, 'metadata'):
-            self._file = file
-            self.read_file_metadata(file)
+        self._file = file
+        self.read_file_metadata()
 
     def __str__(self) -> str:
         return f"{type(self).__name__}({self.file})"
@@ -95,20 +203,33 @@ class Media(metaclass=MediaType):
         return self._file
 
     def read_file_metadata(self) -> None:
-        """Parse and store metadata from file as specified in class metadata."""
-        parsed_metadata = MediaInfo.parse(self.file)
-        for track in parsed_metadata.tracks:
-            data = track.to_data()
-            for property in data:
-                name = track.track_type.lower() + '_' + property
-                try:
-                    if Metadata[name] in self.metadata:
-                        setattr(self, Metadata[name].value, data[property])
-                except KeyError:
-                    pass
-        
-        for prop in self.metadata:
-            validators.BaseValidator.validate_exists(prop, getattr(self, prop.value))
+        """Parse and store metadata from file as specified in class metadata.
+
+        File name and extension are taken from the path. MediaInfo is only used if any other metadata
+        is needed, and its results are cached, so the file is only parsed again once it has been modified.
+        """
+        file, metadata, metadata_by_track = self.file, self.metadata, self._metadata_by_track
+        file_name, extension = os.path.splitext(os.path.basename(file))
+        for prop, value in zip(_PATH_METADATA, (file_name, extension[1:])):
+            if prop in metadata:
+                setattr(self, prop.value, value)
+
+        if metadata_by_track:
+            tracks = _parse_tracks(_file_key(file))
+            for track_type, fields in metadata_by_track.items():
+                track = tracks.get(track_type)
+                if track is not None:
+                    for property, prop in fields:
+                        # Tracks give None for fields MediaInfo did not report.
+                        value = getattr(track, property)
+                        if value is not None:
+                            setattr(self, prop.value, value)
+
+        for prop in metadata:
+            value = getattr(self, prop.value)
+            # Only call into the validator for the error, present values need no further checks here.
+            if value is None:
+                validators.BaseValidator.validate_exists(prop, value)
 
 
 class Video(Media):
@@ -125,9 +246,8 @@ class Video(Media):
         Returns:
             Audio: Audio object of the newly extracted audio file.
         """
-        clip = mp.VideoFileClip(self.file)
         new_filename = self.file_name + ".wav"
-        clip.audio.write_audiofile(new_filename)
+        transcode.write_audio(self.file, new_filename)
         return Audio(new_filename)
 
 
@@ -137,8 +257,14 @@ class Audio(Media):
     Attributes:
         metadata (tuple[Metadata]): The types of supported metadata.
     """
+    __slots__ = ('_intervals_cache', '_sound_interval_args')
     metadata = (Metadata.file_name, Metadata.extension, Metadata.duration, Metadata.date_created)
 
+    def __init__(self, file:str) -> None:
+        super().__init__(file)
+        self._intervals_cache = {}
+        self._sound_interval_args = ()
+
     def convert_audio(self, desired_format:str) -> 'Audio':
         """Convert the audio into the desired format and save it under the same name.
 
@@ -148,24 +274,24 @@ class Audio(Media):
         Returns:
             Audio: Audio object of the newly extracted audio file.
         """
-        clip = mp.AudioFileClip(self.file)
         new_filename = self.file_name + '.' + desired_format.rstrip('.')
-        clip.write_audiofile(new_filename)
+        transcode.write_audio(self.file, new_filename)
         return Audio(new_filename)
 
     @property
     def sound_intervals(self) -> list[tuple[int, int]]:
         """list[tuple[int, int]]: Intervals in milliseconds where sound is present.
         
-        If sound intervals are not currently cached, calls self.get_sound_intervals() to generate them.
+        Uses the arguments of the last call to self.get_sound_intervals(), or its defaults if it has not
+        been called yet. Intervals are recalculated if the file has been modified since.
         """
-        if not hasattr(self, '_sound_intervals'):
-            self.get_sound_intervals()
-        return self._sound_intervals['intervals']
+        return self.get_sound_intervals(*self._sound_interval_args)
 
     def get_sound_intervals(self, min_sound_len:int=500, min_silence_len:int=500, silence_thresh:int=-24, seek_step:int=10) -> list[tuple[int, int]]:
         """Calculate intervals in milliseconds during where sound is present and store them in a cache.
 
+        The cache holds results for each combination of arguments, as long as the file is not modified.
+
         Args:
             min_sound_len (int, optional): Minimum length of a sound for it to be registered (in ms). Defaults to 500.
             min_silence_len (int, optional): Minimum length of silence for it to be registered (in ms). Defaults to 500.
@@ -175,14 +301,14 @@ class Audio(Media):
         Returns:
             list[tuple[int, int]]: Intervals in milliseconds where sound is present.
         """
-        if not hasattr(self, '_sound_intervals') or self._sound_intervals['args'] != (min_sound_len, min_silence_len, silence_thresh, seek_step):
-            segment = AudioSegment.from_file(self.file)
-            raw_intervals = silence.detect_nonsilent(segment, min_silence_len, silence_thresh, seek_step)
-            self._sound_intervals = {
-                'intervals': [tuple(inter) for inter in raw_intervals if inter[1] - inter[0] >= min_sound_len],
-                'args': (min_sound_len, min_silence_len, silence_thresh, seek_step)
-            }
-        return self.sound_intervals
+        args = (min_sound_len, min_silence_len, silence_thresh, seek_step)
+        file_key = _file_key(self.file)
+        cached = self._intervals_cache.get(args)
+        if cached is None or cached[0] != file_key:
+            cached = (file_key, list(_compute_sound_intervals(file_key, *args)))
+            self._intervals_cache[args] = cached
+        self._sound_interval_args = args
+        return cached[1]
 
     def plot_silence(self, min_sound_len:int=500, min_silence_len:int=500, silence_thresh:int=-24, seek_step:int=10):
         """Generate a pyplot showing sound and silence.
@@ -193,13 +319,10 @@ class Audio(Media):
             silence_thresh (int, optional): Upper bound for quietness of a silence (in dFBS). Defaults to -24.
             seek_step (int, optional): Step size for interating over the segment (in ms). Defaults to 10.
         """
-        intervals = self.get_sound_intervals(min_sound_len, min_silence_len, silence_thresh, seek_step)
-        xvals = [0]
-        yvals = [0]
-        for inter in intervals:
-            xvals.extend([inter[0],inter[0],inter[1],inter[1]])
-            yvals.extend([0,1,1,0])
-        xvals.append(self.duration)
-        yvals.append(0)
+        import matplotlib.pyplot as plt
+        intervals = np.asarray(self.get_sound_intervals(min_sound_len, min_silence_len, silence_thresh, seek_step), dtype=np.int64).reshape(-1, 2)
+        # Each interval (start, end) becomes the points (start, 0), (start, 1), (end, 1), (end, 0).
+        xvals = np.concatenate(([0], intervals.repeat(2, axis=1).ravel(), [self.duration]))
+        yvals = np.concatenate(([0], np.tile([0, 1, 1, 0], len(intervals)), [0]))
         plt.plot(xvals, yvals)
         plt.show()
\ No newline at end of file
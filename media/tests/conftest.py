@@ -1,3 +1,5 @@
+import os
+import shutil
 import pytest
 
 @pytest.fixture(scope='session')
@@ -7,4 +9,15 @@ def error_contains():
             if str(arg) not in str(ex):
                 return False
         return True
-    return fn
\ No newline at end of file
+    return fn
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """Copy the sample audio file of the repository into a temporary directory, so tests can modify it."""
+    source = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'sample.wav')
+    if not os.path.exists(source):
+        pytest.skip('sample.wav is not available')
+    destination = tmp_path / 'sample.wav'
+    shutil.copyfile(source, destination)
+    return str(destination)
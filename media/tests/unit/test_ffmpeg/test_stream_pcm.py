@@ -0,0 +1,34 @@
+import contextlib
+import subprocess
+import numpy as np
+import pytest
+from media.utils import ffmpeg
+
+
+@pytest.fixture(autouse=True)
+def ffmpeg_available():
+    if not ffmpeg.available():
+        pytest.skip('ffmpeg is not installed')
+
+
+@pytest.mark.parametrize('frame_rate', [8000, 48000])
+@pytest.mark.parametrize('chunk_size', [4096, 1 << 20])
+def test_stream_pcm(sample_file, frame_rate, chunk_size):
+    """Test if stream_pcm yields full chunks of mono samples for the whole duration of the file."""
+    chunks = list(ffmpeg.stream_pcm(sample_file, frame_rate, chunk_size))
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_size
+    samples = np.frombuffer(b''.join(chunks), dtype=np.int16)
+    assert len(samples) == pytest.approx(30 * frame_rate, abs=frame_rate // 100)
+    assert np.abs(samples).max() > 0
+
+def test_stream_pcm_close(sample_file):
+    """Test if closing the stream early does not raise an exception."""
+    with contextlib.closing(ffmpeg.stream_pcm(sample_file, 48000, 4096)) as chunks:
+        assert len(next(chunks)) == 4096
+
+def test_stream_pcm_missing_file(tmp_path):
+    """Test if stream_pcm raises a CalledProcessError exception with the error of ffmpeg if it cannot read the file."""
+    with pytest.raises(subprocess.CalledProcessError) as ex:
+        list(ffmpeg.stream_pcm(str(tmp_path / 'missing.wav'), 48000))
+    assert 'missing.wav' in ex.value.stderr
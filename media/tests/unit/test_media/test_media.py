@@ -0,0 +1,138 @@
+import os
+import pytest
+from media.modules import media
+from media.modules.media import Audio, Metadata
+from media.utils.validators import BaseValidator
+from media.utils import ffmpeg
+
+
+class Sample(Audio):
+    """Audio without date_created, which MediaInfo does not report on every platform."""
+    metadata = (Metadata.file_name, Metadata.extension, Metadata.duration)
+
+def without_metadata(cls, file):
+    """Create an object of cls for file without reading metadata from the file."""
+    obj = object.__new__(cls)
+    obj._file = file
+    obj.file_name = os.path.splitext(os.path.basename(file))[0]
+    return obj
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    """Work in an empty directory, as new audio files are written to the working directory."""
+    directory = tmp_path / 'output'
+    directory.mkdir()
+    monkeypatch.chdir(directory)
+    return directory
+
+@pytest.fixture
+def new_files(monkeypatch):
+    """Let methods creating audio files return the new file names instead of Audio objects."""
+    monkeypatch.setattr(media, 'Audio', str)
+
+@pytest.fixture
+def touch():
+    def fn(file):
+        """Give file a new version, by changing its modification time."""
+        st = os.stat(file)
+        os.utime(file, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    return fn
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """Record the files MediaInfo parses."""
+    calls = []
+    parse = media.MediaInfo.parse
+    def fn(file, *args, **kwargs):
+        calls.append(file)
+        return parse(file, *args, **kwargs)
+    monkeypatch.setattr(media.MediaInfo, 'parse', fn)
+    return calls
+
+@pytest.fixture
+def decoder_available():
+    if not ffmpeg.available():
+        pytest.importorskip('pydub')
+
+
+def test_extract_audio(sample_file, output_dir, new_files):
+    """Test if extract_audio writes the audio as a .wav file named after the video in the working directory."""
+    av = pytest.importorskip('av')
+    new_file = without_metadata(media.Video, sample_file).extract_audio()
+    assert new_file == 'sample.wav'
+    with av.open(str(output_dir / new_file)) as container:
+        assert container.streams.audio[0].codec_context.name == 'pcm_s16le'
+        assert container.streams.audio[0].rate == 44100
+
+@pytest.mark.parametrize('desired_format', ['flac', 'mp3', 'ogg'])
+def test_convert_audio(sample_file, output_dir, new_files, desired_format):
+    """Test if convert_audio writes the audio in the desired format under the same name in the working directory."""
+    av = pytest.importorskip('av')
+    new_file = without_metadata(Audio, sample_file).convert_audio(desired_format)
+    assert new_file == 'sample.' + desired_format
+    with av.open(str(output_dir / new_file)) as container:
+        assert desired_format in container.format.name.split(',')
+        assert container.duration / av.time_base == pytest.approx(30, abs=0.1)
+
+def test_read_file_metadata(sample_file):
+    """Test if file name and extension are taken from the path and duration is read by MediaInfo."""
+    obj = Sample(sample_file)
+    assert (obj.file_name, obj.extension, obj.duration) == ('sample', 'wav', 30000)
+
+def test_metadata_by_track():
+    """Test if only metadata that is not derived from the path is read from MediaInfo tracks."""
+    assert Sample._metadata_by_track == {'General': (('duration', Metadata.duration),)}
+
+@pytest.mark.parametrize('cls', [Sample, Audio, media.Video])
+def test_slots(cls):
+    """Test if instances store metadata in slots instead of a __dict__."""
+    obj = object.__new__(cls)
+    assert not hasattr(obj, '__dict__')
+    slots = {slot for klass in cls.__mro__ for slot in getattr(klass, '__slots__', ())}
+    assert {BaseValidator.storage_name(prop.name) for prop in cls.metadata} <= slots
+    with pytest.raises(AttributeError):
+        obj.unknown = 1
+
+def test_parse_cached(sample_file, touch, parse_calls):
+    """Test if MediaInfo parses a file only once per version, also for different objects."""
+    Sample(sample_file)
+    Sample(sample_file)
+    assert len(parse_calls) == 1
+    touch(sample_file)
+    Sample(sample_file)
+    assert len(parse_calls) == 2
+
+def test_sound_intervals_cached(sample_file, decoder_available):
+    """Test if sound intervals are calculated once per file and arguments, also for different objects."""
+    media._compute_sound_intervals.cache_clear()
+    intervals = Sample(sample_file).get_sound_intervals()
+    assert intervals
+    assert Sample(sample_file).get_sound_intervals() == intervals
+    assert media._compute_sound_intervals.cache_info().misses == 1
+    Sample(sample_file).get_sound_intervals(min_silence_len=300)
+    assert media._compute_sound_intervals.cache_info().misses == 2
+
+def test_sound_intervals_file_changed(sample_file, touch, decoder_available):
+    """Test if sound_intervals are recalculated with the last arguments once the file has been modified."""
+    media._compute_sound_intervals.cache_clear()
+    obj = Sample(sample_file)
+    intervals = obj.get_sound_intervals(min_silence_len=300)
+    assert obj.sound_intervals == intervals
+    assert media._compute_sound_intervals.cache_info().misses == 1
+    touch(sample_file)
+    assert obj.sound_intervals == intervals
+    assert media._compute_sound_intervals.cache_info().misses == 2
+
+def test_plot_silence(sample_file, monkeypatch, decoder_available):
+    """Test if plot_silence plots a line from 0 to the duration, at 1 during sound and at 0 during silence."""
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    obj = Sample(sample_file)
+    obj.plot_silence()
+    xvals, yvals = plt.gca().lines[-1].get_data()
+    plt.close('all')
+    assert (xvals[0], xvals[-1]) == (0, obj.duration)
+    assert len(xvals) == len(yvals) == 4 * len(obj.sound_intervals) + 2
+    assert set(yvals) == {0, 1}
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+import pytest
+from media.modules.media import Media, Video, Audio
+from media.utils.validators import BaseValidator
+
+
+def make_prop(name):
+    """Build a stand-in for a Metadata member without descriptor kwargs."""
+    return SimpleNamespace(name=name, descriptor=BaseValidator, kwargs={}, _build_descriptor=BaseValidator)
+
+@pytest.fixture
+def two_field_cls():
+    return type('two_field_cls', (Media,), {'metadata': (make_prop('title'), make_prop('artist'))})
+
+def test_same_config_no_alias(two_field_cls):
+    """Test if metadata with the same descriptor configuration is stored separately."""
+    obj = object.__new__(two_field_cls)
+    obj.title = 'T'
+    obj.artist = 'A'
+    assert (obj.title, obj.artist) == ('T', 'A')
+
+@pytest.mark.parametrize('cls', [Video, Audio])
+def test_descriptor_storage(cls):
+    """Test if the descriptor of each metadata stores its value under its own name."""
+    for prop in cls.metadata:
+        assert vars(cls)[prop.name]._storage_name == BaseValidator.storage_name(prop.name)
+
+def test_descriptors_shared():
+    """Test if classes supporting the same metadata share its descriptor."""
+    for prop in set(Video.metadata) & set(Audio.metadata):
+        assert vars(Video)[prop.name] is vars(Audio)[prop.name]
+
+def test_subclass_without_metadata_has_dict(sample_file):
+    """Test if a subclass not defining metadata can set attributes of its own."""
+    class MyMedia(Media):
+        def __init__(self, file:str) -> None:
+            super().__init__(file)
+            self.note = 'x'
+
+    obj = MyMedia(sample_file)
+    assert obj.note == 'x'
+    assert '__slots__' not in vars(MyMedia)
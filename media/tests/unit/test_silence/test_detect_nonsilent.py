@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from media.utils import silence
+from media.utils.silence import detect_nonsilent, detect_nonsilent_stream
+
+
+FRAME_RATE = 8000
+MAX_AMPLITUDE = 32768
+
+
+@pytest.fixture
+def create_samples():
+    def fn(*parts):
+        """Build mono samples from (length in ms, amplitude) parts."""
+        return np.concatenate([np.full(FRAME_RATE * length // 1000, amplitude, dtype=np.float32) for length, amplitude in parts])
+    return fn
+
+@pytest.mark.parametrize('parts, expected', [
+    (((1000, 0),), []),
+    (((1000, 10000),), [[0, 1000]]),
+    (((500, 0), (1000, 10000), (500, 0)), [[500, 1500]]),
+    (((1000, 10000), (1000, 0)), [[0, 1000]]),
+    (((1000, 0), (1000, 10000)), [[1000, 2000]]),
+    (((500, 10000), (500, 0), (500, 10000)), [[0, 500], [1000, 1500]]),
+    (((500, 10000), (100, 0), (500, 10000)), [[0, 1100]])
+])
+def test_detect_nonsilent(create_samples, parts, expected):
+    """Test if detect_nonsilent finds the correct intervals in samples with clear sound and silence."""
+    samples = create_samples(*parts)
+    assert detect_nonsilent(samples, FRAME_RATE, MAX_AMPLITUDE, min_silence_len=200, silence_thresh=-24, seek_step=10) == expected
+
+def test_detect_nonsilent_short(create_samples):
+    """Test if detect_nonsilent considers samples shorter than min_silence_len to be sound."""
+    samples = create_samples((100, 0))
+    assert detect_nonsilent(samples, FRAME_RATE, MAX_AMPLITUDE, min_silence_len=200) == [[0, 100]]
+
+
+@pytest.mark.parametrize('frame_rate', [8000, 44100])
+@pytest.mark.parametrize('min_silence_len, silence_thresh, seek_step', [
+    (500, -24, 10),
+    (120, -30, 7),
+    (50, -16, 1)
+])
+def test_detect_nonsilent_matches_pydub(frame_rate, min_silence_len, silence_thresh, seek_step):
+    """Test if detect_nonsilent gives the same intervals as pydub.silence.detect_nonsilent."""
+    pydub = pytest.importorskip('pydub')
+    from pydub import silence
+    rng = np.random.default_rng(frame_rate + min_silence_len)
+    envelope = np.repeat(rng.uniform(0, 8000, size=40), 3 * frame_rate // 40)
+    samples = (rng.standard_normal(len(envelope)) * envelope).clip(-32768, 32767).astype(np.int16)
+    segment = pydub.AudioSegment(samples.tobytes(), frame_rate=frame_rate, sample_width=2, channels=1)
+    expected = silence.detect_nonsilent(segment, min_silence_len, silence_thresh, seek_step)
+    assert detect_nonsilent(samples.astype(np.float32), frame_rate, MAX_AMPLITUDE, min_silence_len, silence_thresh, seek_step) == expected
+
+
+@pytest.mark.parametrize('workers', [2, 3, 8])
+def test_detect_nonsilent_parallel(workers):
+    """Test if detect_nonsilent gives the same intervals when splitting long audio over multiple threads."""
+    rng = np.random.default_rng(workers)
+    envelope = np.repeat(rng.uniform(0, 8000, size=700), FRAME_RATE // 10)
+    samples = (rng.standard_normal(len(envelope)) * envelope).astype(np.float32)
+    expected = detect_nonsilent(samples, FRAME_RATE, MAX_AMPLITUDE, 300, -24, 10, workers=1)
+    assert detect_nonsilent(samples, FRAME_RATE, MAX_AMPLITUDE, 300, -24, 10, workers=workers) == expected
+
+
+@pytest.mark.parametrize('min_sound_len, expected', [
+    (0, [[0, 300], [600, 1400], [1700, 1800]]),
+    (100, [[0, 300], [600, 1400], [1700, 1800]]),
+    (101, [[0, 300], [600, 1400]]),
+    (800, [[600, 1400]]),
+    (801, [])
+])
+def test_detect_nonsilent_min_sound_len(create_samples, min_sound_len, expected):
+    """Test if detect_nonsilent leaves out intervals shorter than min_sound_len."""
+    samples = create_samples((300, 10000), (300, 0), (800, 10000), (300, 0), (100, 10000))
+    assert detect_nonsilent(samples, FRAME_RATE, MAX_AMPLITUDE, 200, -24, 10, min_sound_len=min_sound_len) == expected
+
+
+@pytest.mark.parametrize('frame_rate', [8000, 44100])
+@pytest.mark.parametrize('chunk_size', [1, 999, 4096, 1 << 20])
+def test_detect_nonsilent_stream(frame_rate, chunk_size):
+    """Test if detect_nonsilent_stream gives the same intervals as detect_nonsilent, for any chunk size."""
+    rng = np.random.default_rng(frame_rate + chunk_size)
+    envelope = np.repeat(rng.uniform(0, 8000, size=20), frame_rate // 10)[:-7]
+    samples = (rng.standard_normal(len(envelope)) * envelope).astype(np.int16)
+    data = samples.tobytes()
+    chunks = (data[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+    expected = detect_nonsilent(samples, frame_rate, MAX_AMPLITUDE, 120, -30, 7)
+    assert detect_nonsilent_stream(chunks, frame_rate, MAX_AMPLITUDE, 120, -30, 7) == expected
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def chunk_power(request):
+    if request.param == 'numpy':
+        return silence._numpy_chunk_power
+    pytest.importorskip('numba')
+    return silence._chunk_power_fn()
+
+@pytest.mark.parametrize('samples, bounds, expected', [
+    (np.array([1, 2, 3, 4], dtype=np.int16), np.array([0, 2, 4]), [5, 25]),
+    (np.array([1, 2, 3, 4, 30000], dtype=np.int16), np.array([0, 2, 4]), [5, 25]),
+    (np.array([1, 2, 3], dtype=np.int16), np.array([0, 2, 3, 3]), [5, 9, 0]),
+    (np.full(8004, 30000, dtype=np.int16), np.arange(1001) * 8, [8 * 30000 ** 2] * 1000)
+])
+def test_chunk_power(chunk_power, samples, bounds, expected):
+    """Test if both implementations sum the squared samples per millisecond, ignoring samples past the last bound."""
+    assert chunk_power(samples, bounds).tolist() == expected
+
+def test_detect_nonsilent_partial_last_ms(create_samples):
+    """Test if samples past the last whole millisecond are ignored, like pydub does."""
+    samples = np.concatenate((create_samples((1000, 0)), np.full(4, 30000, dtype=np.float32)))
+    assert detect_nonsilent(samples, FRAME_RATE, MAX_AMPLITUDE, min_silence_len=200, silence_thresh=-24, seek_step=1) == []
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from media.utils.transcode import write_audio
+
+av = pytest.importorskip('av')
+
+
+def decode(file):
+    """Decode all audio of a file into one array of shape (channels, samples), with its sample rate."""
+    with av.open(file) as container:
+        stream = container.streams.audio[0]
+        frames = [frame.to_ndarray() if frame.format.is_planar else frame.to_ndarray().reshape(-1, stream.channels).T
+                  for frame in container.decode(stream)]
+        samples = np.concatenate(frames, axis=1)
+        return samples, stream.rate
+
+
+@pytest.mark.parametrize('extension', ['wav', 'flac'])
+def test_write_audio_lossless(sample_file, tmp_path, extension):
+    """Test if audio written with a lossless codec decodes to exactly the source samples."""
+    destination = str(tmp_path / f'out.{extension}')
+    write_audio(sample_file, destination)
+    assert np.array_equal(*(decode(file)[0] for file in (sample_file, destination)))
+    assert decode(destination)[1] == decode(sample_file)[1]
+
+@pytest.mark.parametrize('extension, rate', [('mp3', 44100), ('m4a', 44100), ('ogg', 48000), ('opus', 48000)])
+def test_write_audio_lossy(sample_file, tmp_path, extension, rate):
+    """Test if audio written with a lossy codec keeps the channels and duration, at a rate the codec supports."""
+    destination = str(tmp_path / f'out.{extension}')
+    write_audio(sample_file, destination)
+    source, source_rate = decode(sample_file)
+    samples, out_rate = decode(destination)
+    assert out_rate == rate
+    assert len(samples) == len(source)
+    assert samples.shape[1] / out_rate == pytest.approx(source.shape[1] / source_rate, abs=0.1)
@@ -0,0 +1,115 @@
+import os
+import time
+from datetime import datetime
+import pytest
+from media.utils.validators import DateValidator
+
+
+FORMATS = ('%H:%M:%S %d/%m/%Y', '%Z %Y-%m-%d %H:%M:%S.%f')
+
+@pytest.mark.parametrize('date, expected', [
+    ('12:30:15 01/02/2021', datetime(2021, 2, 1, 12, 30, 15)),
+    ('UTC 2021-11-18 15:32:09.123', datetime(2021, 11, 18, 15, 32, 9, 123000)),
+    ('UTC 2021-11-18 15:32:09.000001', datetime(2021, 11, 18, 15, 32, 9, 1))
+])
+@pytest.mark.parametrize('formats', [FORMATS, list(FORMATS)])
+def test_str_to_datetime(date, expected, formats):
+    """Test if str_to_datetime parses dates matching any of the formats, also when repeated."""
+    assert DateValidator.str_to_datetime(date, formats) == expected
+    assert DateValidator.str_to_datetime(date, formats) == expected
+
+@pytest.mark.parametrize('date', [
+    '', '2021-11-18', '12:30:15', 'UTC 2021-11-18 15:32:09', '25:30:15 01/02/2021'
+])
+def test_str_to_datetime_invalid(date, error_contains):
+    """Test if str_to_datetime raises the correct ValueError exception for dates matching none of the formats."""
+    for _ in range(2):
+        with pytest.raises(ValueError) as ex:
+            DateValidator.str_to_datetime(date, FORMATS)
+        assert error_contains(ex, [date, FORMATS])
+
+
+@pytest.mark.parametrize('date, fmt', [
+    ('UTC 2021-11-18 15:32:09.5', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('UTC 1999-01-01 00:00:00.999999', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('GMT 2021-11-18 15:32:09.123', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('UTC 2021-1-8 15:32:09.123', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('2021-11-18', '%Y-%m-%d'),
+    ('2021-1-8', '%Y-%m-%d'),
+])
+def test_str_to_datetime_fast_formats(date, fmt):
+    """Test if str_to_datetime gives the same result as strptime for formats with a faster parser."""
+    assert DateValidator.str_to_datetime(date, (fmt,)) == datetime.strptime(date, fmt)
+
+@pytest.mark.parametrize('date, fmt', [
+    ('UTC 2021-02-30 15:32:09.123', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('UTC 2021-11-18 15:32:09.1234567', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('UTC 2021-11-18 15:32:09.123+01:00', '%Z %Y-%m-%d %H:%M:%S.%f'),
+    ('2021-13-01', '%Y-%m-%d'),
+    ('2021-11-18T', '%Y-%m-%d'),
+    ('2021/11/18', '%Y-%m-%d'),
+])
+def test_str_to_datetime_fast_formats_invalid(date, fmt):
+    """Test if str_to_datetime raises a ValueError exception like strptime for formats with a faster parser."""
+    with pytest.raises(ValueError):
+        datetime.strptime(date, fmt)
+    with pytest.raises(ValueError):
+        DateValidator.str_to_datetime(date, (fmt,))
+
+@pytest.mark.parametrize('date, fmt', [
+    ('12:30:15 01/02/2021', '%H:%M:%S %d/%m/%Y'),
+    ('12:30:15 1/2/2021', '%H:%M:%S %d/%m/%Y'),
+    ('12:30:15 01/02/2021 ', '%H:%M:%S %d/%m/%Y'),
+    ('25:30:15 01/02/2021', '%H:%M:%S %d/%m/%Y'),
+    ('12:30:15 31/02/2021', '%H:%M:%S %d/%m/%Y'),
+    ('Nov 18 2021', '%b %d %Y'),
+    ('nov 18 2021', '%b %d %Y'),
+    ('November 18 2021', '%b %d %Y'),
+    ('2021', '%Y%'),
+])
+def test_str_to_datetime_matches_strptime(date, fmt):
+    """Test if str_to_datetime accepts and rejects the same dates as strptime for formats without a faster parser."""
+    try:
+        expected = datetime.strptime(date, fmt)
+    except ValueError:
+        with pytest.raises(ValueError):
+            DateValidator.str_to_datetime(date, (fmt,))
+    else:
+        assert DateValidator.str_to_datetime(date, (fmt,)) == expected
+
+
+@pytest.fixture
+def set_tz():
+    if not hasattr(time, 'tzset'):
+        pytest.skip('time zones can only be changed on Unix')
+    original = os.environ.get('TZ')
+    def fn(tz):
+        os.environ['TZ'] = tz
+        time.tzset()
+    yield fn
+    if original is None:
+        os.environ.pop('TZ', None)
+    else:
+        os.environ['TZ'] = original
+    time.tzset()
+
+@pytest.mark.parametrize('tz, date', [
+    ('Europe/Amsterdam', 'CET 2021-11-18 15:32:09'),
+    ('America/New_York', 'EST 2021-11-18 15:32:09'),
+])
+def test_str_to_datetime_time_zone(set_tz, tz, date):
+    """Test if str_to_datetime accepts the names of the current time zone like strptime, also after it changes."""
+    fmt = '%Z %Y-%m-%d %H:%M:%S'
+    DateValidator.str_to_datetime('UTC 2021-11-18 15:32:09', (fmt,))
+    set_tz(tz)
+    assert DateValidator.str_to_datetime(date, (fmt,)) == datetime.strptime(date, fmt)
+
+def test_str_to_datetime_cache_time_zone(set_tz):
+    """Test if a date parsed in one time zone is not accepted from the cache after the time zone changes."""
+    fmt = '%Z %Y-%m-%d %H:%M:%S'
+    date = 'EST 2021-11-18 15:32:09'
+    set_tz('America/New_York')
+    DateValidator.str_to_datetime(date, (fmt,))
+    set_tz('UTC')
+    with pytest.raises(ValueError):
+        DateValidator.str_to_datetime(date, (fmt,))
@@ -60,4 +60,57 @@ def test_create_invalid_bounds(min_, max_, create_intval_cls, error_contains):
 # def test_create_invalid_bound_type(bound_name, bound_value, create_intval_cls, error_contains):
 #     with pytest.raises(TypeError) as ex:
 #         create_intval_cls(**{bound_name: bound_value})
-#     assert error_contains(ex, [bound_name, bound_value, type(bound_value), int])
\ No newline at end of file
+#     assert error_contains(ex, [bound_name, bound_value, type(bound_value), int])
+
+def test_set_valid(create_intval_cls, parametrized_bounds):
+    """Test if an IntValidator attribute can be set to values within its bounds."""
+    obj = create_intval_cls(**parametrized_bounds)()
+    for val in range(parametrized_bounds['min_value'], parametrized_bounds['max_value']+1):
+        obj.prop = val
+        assert obj.prop == val
+
+def test_set_invalid(create_intval_cls, parametrized_bounds):
+    """Test if setting an IntValidator attribute to invalid values raises the same exceptions as validate."""
+    cls = create_intval_cls(**parametrized_bounds)
+    obj = cls()
+    for val in (parametrized_bounds['min_value']-1, parametrized_bounds['max_value']+1, None, 'hello', 10.5):
+        with pytest.raises((TypeError, ValueError)) as set_ex:
+            obj.prop = val
+        with pytest.raises(set_ex.type) as validate_ex:
+            cls.prop.validate('prop', val)
+        assert str(set_ex.value) == str(validate_ex.value)
+
+@pytest.mark.parametrize('value', [6, 10])
+def test_set_after_bound_change(create_intval_cls, value):
+    """Test if assignments are checked against the bounds of an IntValidator after they have been changed."""
+    cls = create_intval_cls(min_value=0, max_value=10)
+    cls.prop.max_value = 5
+    with pytest.raises(ValueError):
+        cls().prop = value
+
+def test_set_overridden_validate():
+    """Test if assignments are checked by the validate method of an IntValidator subclass."""
+    class EvenValidator(IntValidator):
+        def validate(self, name, value):
+            value = super().validate(name, value)
+            if value % 2:
+                raise ValueError(f"{name} should be even")
+            return value
+    cls = type('evenval_cls', (), {'prop': EvenValidator(0, 10)})
+    obj = cls()
+    obj.prop = 4
+    with pytest.raises(ValueError):
+        obj.prop = 3
+
+@pytest.mark.parametrize('slots', [None, (IntValidator.storage_name('count'), '_count')])
+def test_storage_no_collision(slots):
+    """Test if an IntValidator attribute is stored separately from a private attribute of the same name."""
+    cls_dict = {'count': IntValidator(0, 10)}
+    if slots is not None:
+        cls_dict['__slots__'] = slots
+    obj = type('count_cls', (), cls_dict)()
+    obj.count = 5
+    obj._count = 'private'
+    assert (obj.count, obj._count) == (5, 'private')
+    with pytest.raises(ValueError):
+        obj.count = 11
@@ -0,0 +1,102 @@
+import pytest
+from media.utils.validators import StringValidator
+
+
+@pytest.mark.parametrize('value, valid_chars', [
+    ('hello', 'abcdefghijklmnopqrstuvwxyz'),
+    ('', 'abc'),
+    ('', ''),
+    ('a-b_c.(d) e', frozenset('-_.() abcde')),
+    ('[^]\\', ['[', '^', ']', '\\']),
+    ('anything', None),
+    ('a_long_file_name_of_a_meeting_2021-11-18', 'abcdefghijklmnopqrstuvwxyz_-0123456789'),
+    ('een_lange_bestandsnaam_van_een_vergadering_é', 'abcdefghijklmnopqrstuvwxyz_é'),
+    ('x' * 64, ['x', 'é'])
+])
+def test_validate_chars(value, valid_chars):
+    """Test if validate_chars raises no exceptions when a value only contains valid characters."""
+    StringValidator.validate_chars('prop', value, valid_chars)
+
+@pytest.mark.parametrize('value, valid_chars, invalid_char', [
+    ('hello!', 'abcdefghijklmnopqrstuvwxyz', '!'),
+    ('a', '', 'a'),
+    ('a-b', 'ab', '-'),
+    ('x^y', frozenset('xy'), '^'),
+    ('abc]', '[abc', ']'),
+    ('a_long_file_name_of_a_meeting_2021-11-18!', 'abcdefghijklmnopqrstuvwxyz_-0123456789', '!'),
+    ('een_lange_bestandsnaam_van_een_vergadering_é', 'abcdefghijklmnopqrstuvwxyz_', 'é'),
+    ('x' * 63 + 'y', ['x', 'é'], 'y'),
+    ('ab', ['ab'], 'a'),
+    ('xyq', ['x', 'yz', 'q'], 'y'),
+    ('x' * 63 + 'y', ['x', 'yz'], 'y'),
+    ('1', [1, 2], '1')
+])
+def test_validate_chars_invalid(value, valid_chars, invalid_char, error_contains):
+    """Test if validate_chars raises the correct ValueError exception naming the first invalid character."""
+    with pytest.raises(ValueError) as ex:
+        StringValidator.validate_chars('prop', value, valid_chars)
+    assert error_contains(ex, ['prop', f"'{invalid_char}'"])
+
+
+@pytest.fixture
+def strval_cls():
+    return type('strval_cls', (), {'prop': StringValidator(min_length=1, max_length=5, valid_characters='abc')})
+
+@pytest.fixture
+def long_strval_cls():
+    return type('long_strval_cls', (), {'prop': StringValidator(valid_characters='abc')})
+
+@pytest.mark.parametrize('value', ['a', 'abc', 'cccba'])
+def test_set_valid(strval_cls, value):
+    """Test if a StringValidator attribute can be set to a valid value."""
+    obj = strval_cls()
+    obj.prop = value
+    assert obj.prop == value
+
+@pytest.mark.parametrize('value', ['', 'abcabc', 'abd', None, 123, ['a']])
+def test_set_invalid(strval_cls, value):
+    """Test if setting a StringValidator attribute to an invalid value raises the same exception as validate."""
+    obj = strval_cls()
+    with pytest.raises((TypeError, ValueError)) as set_ex:
+        obj.prop = value
+    with pytest.raises(set_ex.type) as validate_ex:
+        strval_cls.prop.validate('prop', value)
+    assert str(set_ex.value) == str(validate_ex.value)
+
+@pytest.mark.parametrize('value, valid', [('abc' * 20, True), ('abc' * 20 + 'd', False), ('abc' * 20 + 'é', False)])
+def test_set_long(long_strval_cls, value, valid):
+    """Test if a StringValidator attribute accepts and rejects long values like validate."""
+    obj = long_strval_cls()
+    if valid:
+        obj.prop = value
+        assert obj.prop == value
+    else:
+        with pytest.raises(ValueError):
+            obj.prop = value
+
+@pytest.mark.parametrize('setting, setting_value, value', [
+    ('max_length', 2, 'abc'),
+    ('min_length', 4, 'abc'),
+    ('valid_characters', 'ab', 'abc')
+])
+def test_set_after_setting_change(strval_cls, setting, setting_value, value):
+    """Test if assignments are checked against the settings of a StringValidator after they have been changed."""
+    obj = strval_cls()
+    obj.prop = value
+    setattr(strval_cls.prop, setting, setting_value)
+    with pytest.raises(ValueError):
+        obj.prop = value
+
+def test_set_overridden_validate():
+    """Test if assignments are checked by the validate method of a StringValidator subclass."""
+    class LowerValidator(StringValidator):
+        def validate(self, name, value):
+            value = super().validate(name, value)
+            if not value.islower():
+                raise ValueError(f"{name} should be lower case")
+            return value
+    cls = type('lowerval_cls', (), {'prop': LowerValidator(valid_characters='abcABC')})
+    obj = cls()
+    obj.prop = 'abc'
+    with pytest.raises(ValueError):
+        obj.prop = 'ABC'
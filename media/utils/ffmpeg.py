@@ -0,0 +1,48 @@
+import functools
+import shutil
+import subprocess
+import tempfile
+from typing import Iterator
+
+
+@functools.lru_cache(maxsize=None)
+def available() -> bool:
+    """Determine if an ffmpeg executable can be found on the PATH. The result is cached.
+
+    Returns:
+        bool: True if ffmpeg can be run.
+    """
+    return shutil.which('ffmpeg') is not None
+
+
+def stream_pcm(file:str, frame_rate:int, chunk_size:int=1 << 20) -> Iterator[bytes]:
+    """Decode the first audio stream of a media file into mono signed 16-bit little-endian PCM, in chunks.
+
+    Only one chunk is held in memory at a time, so the decoded audio never has to fit in memory as a whole.
+    Each chunk is read straight from the pipe into a new bytes object by the default buffered reader, so
+    no larger buffer is allocated. Closing the generator early closes the pipe, which makes ffmpeg exit.
+    ffmpeg does not read from stdin, and only logs errors. These go to a temporary file rather than a
+    pipe, so ffmpeg can never block on a full pipe nobody reads.
+
+    Args:
+        file (str): File name (+ path) of the media file.
+        frame_rate (int): Number of samples per second to resample the audio to.
+        chunk_size (int, optional): Number of bytes per chunk, should be even. Defaults to 1 MiB.
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg exits with an error. Its error messages are in the stderr
+            attribute.
+
+    Yields:
+        bytes: The next chunk of raw samples. Only the last chunk may be shorter than chunk_size.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', file, '-vn', '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(frame_rate), '-']
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=errors)
+        with process:
+            while chunk := process.stdout.read(chunk_size):
+                yield chunk
+        if process.returncode:
+            errors.seek(0)
+            stderr = errors.read().decode(errors='replace')
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
@@ -0,0 +1,228 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+import numpy as np
+
+# Audio shorter than this (in ms) is not worth splitting over multiple threads.
+PARALLEL_MIN_LEN = 60000
+
+
+def _numpy_chunk_power(samples:np.ndarray, bounds:np.ndarray) -> np.ndarray:
+    """Sum the squared samples between each pair of consecutive bounds."""
+    # reduceat sums the last millisecond up to the end of the array, so leave out samples past the last bound.
+    power = np.append(np.square(samples[:bounds[-1]], dtype=np.float64), 0.0)
+    return np.add.reduceat(power, bounds[:-1])
+
+
+def _loop_chunk_power(samples:np.ndarray, bounds:np.ndarray) -> np.ndarray:
+    """Sum the squared samples between each pair of consecutive bounds, in a single pass.
+
+    Meant to be compiled with Numba, see _chunk_power_fn.
+    """
+    power = np.empty(len(bounds) - 1, dtype=np.float64)
+    for i in range(len(power)):
+        total = 0.0
+        for j in range(bounds[i], bounds[i + 1]):
+            value = np.float64(samples[j])
+            total += value * value
+        power[i] = total
+    return power
+
+
+@functools.lru_cache(maxsize=None)
+def _chunk_power_fn() -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """Choose the function summing the squared samples per millisecond.
+
+    This is _loop_chunk_power compiled by Numba if it is installed, otherwise _numpy_chunk_power. Numba is
+    only imported on first use, so importing this module stays cheap.
+    """
+    try:
+        import numba
+    except ImportError:
+        return _numpy_chunk_power
+    return numba.njit(cache=True, nogil=True, fastmath=True)(_loop_chunk_power)
+
+
+def ms_power(samples:np.ndarray, bounds:np.ndarray, workers:int=None) -> np.ndarray:
+    """Calculate the energy of the samples in each millisecond.
+
+    If Numba is installed, the samples are summed by a compiled loop without any intermediate arrays,
+    otherwise by NumPy. Long audio is split into chunks of whole milliseconds that are processed by a
+    pool of threads. Both release the GIL while summing, so the chunks are processed in parallel.
+
+    Args:
+        samples (np.ndarray): Mono samples of the audio.
+        bounds (np.ndarray): Index of the first sample of each millisecond, followed by the number of samples.
+        workers (int, optional): Number of threads to use. Defaults to None, meaning one per CPU.
+
+    Returns:
+        np.ndarray: Sum of the squared samples in each millisecond.
+    """
+    chunk_power = _chunk_power_fn()
+    ms_count = len(bounds) - 1
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or ms_count < PARALLEL_MIN_LEN:
+        return chunk_power(samples, bounds)
+
+    edges = np.linspace(0, ms_count, workers + 1, dtype=np.int64)
+    chunks = [(samples[bounds[start]:bounds[end]], bounds[start:end + 1] - bounds[start]) for start, end in zip(edges[:-1], edges[1:])]
+    with ThreadPoolExecutor(workers) as pool:
+        return np.concatenate(list(pool.map(chunk_power, *zip(*chunks))))
+
+
+def ms_bounds(start:int, stop:int, frame_rate:int, sample_count:int) -> np.ndarray:
+    """Calculate the index of the first sample of each millisecond in a range.
+
+    Uses the same millisecond to sample rounding as slicing an AudioSegment.
+
+    Args:
+        start (int): First millisecond.
+        stop (int): Millisecond after the last one, of which the first sample is included as the end bound.
+        frame_rate (int): Number of samples per second.
+        sample_count (int): Total number of samples, bounds past the end of the audio are clipped to it.
+
+    Returns:
+        np.ndarray: Sample index of each millisecond from start up to and including stop.
+    """
+    return np.minimum(np.arange(start, stop + 1) * frame_rate // 1000, sample_count)
+
+
+def stream_ms_power(chunks:Iterable[bytes], frame_rate:int, dtype:np.dtype=np.int16) -> tuple[np.ndarray, int]:
+    """Calculate the energy of the samples in each millisecond, reading the samples in chunks.
+
+    Only the samples of the millisecond a chunk ends in are carried over to the next chunk, so the
+    samples never have to be in memory as a whole.
+
+    Args:
+        chunks (Iterable[bytes]): Consecutive chunks of raw mono samples.
+        frame_rate (int): Number of samples per second.
+        dtype (np.dtype, optional): Type of the raw samples. Defaults to np.int16.
+
+    Returns:
+        tuple[np.ndarray, int]: Sum of the squared samples in each millisecond, and the total number of samples.
+    """
+    chunk_power = _chunk_power_fn()
+    itemsize = np.dtype(dtype).itemsize
+    powers = []
+    done_ms, offset = 0, 0
+    tail, rest = np.empty(0, dtype=dtype), b''
+    for chunk in chunks:
+        # A chunk may end halfway through a sample, keep those bytes for the next one.
+        chunk = rest + chunk
+        usable = len(chunk) - len(chunk) % itemsize
+        rest = chunk[usable:]
+        samples = np.concatenate((tail, np.frombuffer(chunk, dtype=dtype, count=usable // itemsize)))
+        # Every millisecond that ends within the samples read so far is complete.
+        total = offset + len(samples)
+        stop = ((total + 1) * 1000 - 1) // frame_rate
+        bounds = ms_bounds(done_ms, stop, frame_rate, total) - offset
+        if stop > done_ms:
+            powers.append(chunk_power(samples[:bounds[-1]], bounds))
+        tail, offset, done_ms = samples[bounds[-1]:], offset + bounds[-1], stop
+
+    sample_count = offset + len(tail)
+    seg_len = round(1000 * sample_count / frame_rate)
+    if seg_len > done_ms:
+        bounds = ms_bounds(done_ms, seg_len, frame_rate, sample_count) - offset
+        powers.append(chunk_power(tail, bounds))
+    power = np.concatenate(powers) if powers else np.empty(0, dtype=np.float64)
+    return power[:seg_len], sample_count
+
+
+def detect_nonsilent(samples:np.ndarray, frame_rate:int, max_amplitude:float, min_silence_len:int=1000, silence_thresh:float=-16, seek_step:int=1, workers:int=None, min_sound_len:int=0) -> list[list[int]]:
+    """Find intervals in milliseconds where sound is present.
+
+    Vectorized equivalent of pydub.silence.detect_nonsilent: a window of min_silence_len milliseconds is
+    silent when its RMS is at most silence_thresh dBFS, and windows are tried every seek_step milliseconds.
+
+    Args:
+        samples (np.ndarray): Mono samples of the audio, as integers or floats.
+        frame_rate (int): Number of samples per second.
+        max_amplitude (float): Largest possible absolute sample value, i.e. 0 dBFS.
+        min_silence_len (int, optional): Minimum length of silence for it to be registered (in ms). Defaults to 1000.
+        silence_thresh (float, optional): Upper bound for quietness of a silence (in dBFS). Defaults to -16.
+        seek_step (int, optional): Step size for iterating over the samples (in ms). Defaults to 1.
+        workers (int, optional): Number of threads to use, see ms_power. Defaults to None.
+        min_sound_len (int, optional): Minimum length of a sound for it to be returned (in ms). Defaults to 0.
+
+    Returns:
+        list[list[int]]: Intervals in milliseconds where sound is present.
+    """
+    seg_len = round(1000 * len(samples) / frame_rate)
+    if seg_len < min_silence_len:
+        return [[0, seg_len]] if seg_len >= min_sound_len else []
+    power = ms_power(samples, ms_bounds(0, seg_len, frame_rate, len(samples)), workers)
+    return detect_nonsilent_power(power, frame_rate, len(samples), max_amplitude, min_silence_len, silence_thresh, seek_step, min_sound_len)
+
+
+def detect_nonsilent_stream(chunks:Iterable[bytes], frame_rate:int, max_amplitude:float, min_silence_len:int=1000, silence_thresh:float=-16, seek_step:int=1, min_sound_len:int=0, dtype:np.dtype=np.int16) -> list[list[int]]:
+    """Find intervals in milliseconds where sound is present, reading the samples in chunks.
+
+    Gives the same intervals as detect_nonsilent, but only keeps the energy per millisecond in memory
+    instead of all samples, see stream_ms_power.
+
+    Args:
+        chunks (Iterable[bytes]): Consecutive chunks of raw mono samples.
+        frame_rate (int): Number of samples per second.
+        max_amplitude (float): Largest possible absolute sample value, i.e. 0 dBFS.
+        min_silence_len (int, optional): Minimum length of silence for it to be registered (in ms). Defaults to 1000.
+        silence_thresh (float, optional): Upper bound for quietness of a silence (in dBFS). Defaults to -16.
+        seek_step (int, optional): Step size for iterating over the samples (in ms). Defaults to 1.
+        min_sound_len (int, optional): Minimum length of a sound for it to be returned (in ms). Defaults to 0.
+        dtype (np.dtype, optional): Type of the raw samples. Defaults to np.int16.
+
+    Returns:
+        list[list[int]]: Intervals in milliseconds where sound is present.
+    """
+    power, sample_count = stream_ms_power(chunks, frame_rate, dtype)
+    return detect_nonsilent_power(power, frame_rate, sample_count, max_amplitude, min_silence_len, silence_thresh, seek_step, min_sound_len)
+
+
+def detect_nonsilent_power(power:np.ndarray, frame_rate:int, sample_count:int, max_amplitude:float, min_silence_len:int=1000, silence_thresh:float=-16, seek_step:int=1, min_sound_len:int=0) -> list[list[int]]:
+    """Find intervals in milliseconds where sound is present, from the energy in each millisecond.
+
+    Args:
+        power (np.ndarray): Sum of the squared samples in each millisecond, see ms_power.
+        frame_rate (int): Number of samples per second.
+        sample_count (int): Total number of samples.
+        max_amplitude (float): Largest possible absolute sample value, i.e. 0 dBFS.
+        min_silence_len (int, optional): Minimum length of silence for it to be registered (in ms). Defaults to 1000.
+        silence_thresh (float, optional): Upper bound for quietness of a silence (in dBFS). Defaults to -16.
+        seek_step (int, optional): Step size for iterating over the samples (in ms). Defaults to 1.
+        min_sound_len (int, optional): Minimum length of a sound for it to be returned (in ms). Defaults to 0.
+
+    Returns:
+        list[list[int]]: Intervals in milliseconds where sound is present.
+    """
+    seg_len = len(power)
+    if seg_len < min_silence_len:
+        return [[0, seg_len]] if seg_len >= min_sound_len else []
+    bounds = ms_bounds(0, seg_len, frame_rate, sample_count)
+
+    last_start = seg_len - min_silence_len
+    starts = np.arange(0, last_start + 1, seek_step)
+    if last_start % seek_step:
+        starts = np.append(starts, last_start)
+    # Energy of each window as a difference of running totals, so every millisecond is only summed once.
+    cumulative = np.concatenate(([0.0], np.cumsum(power)))
+    window_power = cumulative[starts + min_silence_len] - cumulative[starts]
+    window_frames = bounds[starts + min_silence_len] - bounds[starts]
+
+    # Comparing mean squares against the squared threshold avoids a sqrt and log per window.
+    thresh = (10 ** (silence_thresh / 20) * max_amplitude) ** 2
+    silence_starts = starts[window_power <= thresh * window_frames]
+    if not len(silence_starts):
+        return [[0, seg_len]] if seg_len >= min_sound_len else []
+
+    gaps = np.diff(silence_starts)
+    breaks = np.flatnonzero((gaps != seek_step) & (gaps > min_silence_len))
+    silent_starts = silence_starts[np.r_[0, breaks + 1]]
+    silent_ends = silence_starts[np.r_[breaks, len(silence_starts) - 1]] + min_silence_len
+
+    intervals = np.column_stack((np.r_[0, silent_ends], np.r_[silent_starts, seg_len]))
+    if silent_ends[-1] == seg_len:
+        intervals = intervals[:-1]
+    if len(intervals) and intervals[0, 1] == 0:
+        intervals = intervals[1:]
+    return intervals[intervals[:, 1] - intervals[:, 0] >= min_sound_len].tolist()
@@ -0,0 +1,36 @@
+import os
+
+
+# Encoders for file extensions that are not themselves the name of an encoder.
+CODECS = {
+    'wav': 'pcm_s16le',
+    'm4a': 'aac',
+    'ogg': 'libopus',
+    'opus': 'libopus',
+}
+
+
+def write_audio(source:str, destination:str) -> None:
+    """Decode the first audio stream of a media file and encode it into a new audio file.
+
+    Only the audio stream is decoded, so video frames in the source are skipped entirely. The encoder is
+    chosen from the extension of the destination, see CODECS.
+
+    Args:
+        source (str): File name (+ path) of the media file to read.
+        destination (str): File name (+ path) of the audio file to write.
+    """
+    import av
+    extension = os.path.splitext(destination)[1].lstrip('.').lower()
+    codec = CODECS.get(extension, extension)
+    with av.open(source) as inp, av.open(destination, 'w') as out:
+        in_stream = inp.streams.audio[0]
+        rates = av.Codec(codec, 'w').audio_rates
+        rate = in_stream.rate if not rates or in_stream.rate in rates else max(rates)
+        layout = 'mono' if in_stream.channels == 1 else 'stereo'
+        stream = out.add_stream(codec, rate=rate, layout=layout)
+        for frame in inp.decode(in_stream):
+            # Let the encoder generate timestamps, as resampling may change the frame sizes.
+            frame.pts = None
+            out.mux(stream.encode(frame))
+        out.mux(stream.encode(None))
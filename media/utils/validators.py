@@ -1,27 +1,192 @@
+import _strptime
+import functools
+import locale
+import re
+import time
 from datetime import datetime
-from collections.abc import Sequence
+from collections.abc import Collection
 from typing import Union
 
 
+@functools.lru_cache(maxsize=None)
+def invalid_chars_pattern(valid_chars:frozenset) -> re.Pattern:
+    """Compile a regular expression matching any character that is not in valid_chars.
+
+    Patterns are cached, so each set of valid characters is only compiled once. Like membership of the
+    set, only elements that are single characters allow anything.
+
+    Args:
+        valid_chars (frozenset): The characters that are allowed.
+
+    Returns:
+        re.Pattern: Pattern matching a single invalid character.
+    """
+    chars = sorted(char for char in valid_chars if isinstance(char, str) and len(char) == 1)
+    if not chars:
+        return re.compile('.', re.DOTALL)
+    return re.compile('[^' + re.escape(''.join(chars)) + ']')
+
+
+@functools.lru_cache(maxsize=None)
+def valid_ascii_bytes(valid_chars:frozenset) -> bytes:
+    """Collect the ASCII characters in valid_chars as bytes, for use as the delete argument of bytes.translate.
+
+    Deleting them from an ASCII string encoded to bytes leaves exactly its invalid characters, in a single
+    table-driven pass. Results are cached, so each set of valid characters is only converted once.
+    """
+    return bytes(sorted(ord(char) for char in valid_chars if isinstance(char, str) and len(char) == 1 and char.isascii()))
+
+
+# Strings at least this long are checked against valid characters with bytes.translate when they are
+# ASCII. For shorter strings the set lookups are faster than the encoding.
+TRANSLATE_MIN_LEN = 32
+
+
+_UTC_DATETIME_RE = re.compile(r'UTC ([0-9]{4})-([0-9]{2})-([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2})\.([0-9]{1,6})')
+
+
+def _parse_utc_datetime(date:str) -> Union[datetime, None]:
+    """Parse the 'UTC YYYY-MM-DD HH:MM:SS.ffffff' dates MediaInfo produces, or return None."""
+    match = _UTC_DATETIME_RE.fullmatch(date)
+    if match is None:
+        return None
+    *parts, fraction = match.groups()
+    try:
+        return datetime(*map(int, parts), int(fraction.ljust(6, '0')))
+    except ValueError:
+        return None
+
+
+def _parse_iso_date(date:str) -> Union[datetime, None]:
+    """Parse 'YYYY-MM-DD' dates, or return None."""
+    digits = date[:4] + date[5:7] + date[8:]
+    if len(date) != 10 or date[4] != '-' or date[7] != '-' or not (digits.isascii() and digits.isdigit()):
+        return None
+    try:
+        return datetime(int(date[:4]), int(date[5:7]), int(date[8:]))
+    except ValueError:
+        return None
+
+
+# Parsers for common formats that are much faster than strptime. They return None for dates they
+# do not recognise, in which case strptime gets the final say.
+_FAST_PARSERS = {
+    '%Z %Y-%m-%d %H:%M:%S.%f': _parse_utc_datetime,
+    '%Y-%m-%d': _parse_iso_date,
+}
+
+
+def _time_context() -> tuple:
+    """Collect the settings the patterns of strptime depend on: the time locale and the time zone names."""
+    return (locale.getlocale(locale.LC_TIME), time.tzname, time.daylight)
+
+
+@functools.lru_cache(maxsize=None)
+def _format_regex(fmt:str, context:tuple) -> Union[re.Pattern, None]:
+    """Compile the regular expression strptime matches strings against for a format, or return None.
+
+    Patterns are cached per context (see _time_context), as the names of months, days and time zones in
+    them depend on it. They are built from a new TimeRE rather than the one strptime shares, which may
+    still be for an earlier context. None is returned for formats strptime itself rejects, so it gets to
+    raise the error.
+    """
+    try:
+        return _strptime.TimeRE().compile(fmt)
+    except (AttributeError, IndexError, KeyError, ValueError, re.error):
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(date:str, formats:tuple[str, ...], context:tuple) -> datetime:
+    """Parse date with the first of the formats it matches, caching the results per context (see _time_context)."""
+    for fmt in formats:
+        parser = _FAST_PARSERS.get(fmt)
+        if parser is not None:
+            value = parser(date)
+            if value is not None:
+                return value
+        # A string the pattern does not match in full can never be parsed by strptime, so skip the
+        # format without raising and catching a ValueError.
+        regex = _format_regex(fmt, context)
+        if regex is not None:
+            match = regex.match(date)
+            if match is None or match.end() != len(date):
+                continue
+        try:
+            return datetime.strptime(date, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Date {date} does not match any of the specified formats {formats}")
+
+
 class BaseValidator:
+    """Data descriptor validating values before storing them.
+
+    Values are stored in the instance __dict__ under the property name. Instances without a __dict__
+    need a slot named by storage_name instead. Assignments are checked by the function from
+    build_fast_validate, which is rebuilt whenever a setting of the validator changes.
+    """
 
     def __set_name__(self, owner, prop_name):
         self._prop_name = prop_name
+        self._storage_name = self.storage_name(prop_name)
+        self._fast_validate = self.build_fast_validate()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Settings are bound into the fast validation function, so it has to follow their changes.
+        if not name.startswith('_') and '_fast_validate' in self.__dict__:
+            super().__setattr__('_fast_validate', self.build_fast_validate())
 
     def __get__(self, instance, owner):
         if instance is None:
             return self
         else:
-            return instance.__dict__.get(self._prop_name)
+            storage = getattr(instance, '__dict__', None)
+            if storage is not None:
+                return storage.get(self._prop_name)
+            return getattr(instance, self._storage_name, None)
             
     def __set__(self, instance, value):
-        value = self.validate(self._prop_name, value)
-        instance.__dict__[self._prop_name] = value
+        value = self._fast_validate(self._prop_name, value)
+        storage = getattr(instance, '__dict__', None)
+        if storage is not None:
+            storage[self._prop_name] = value
+        else:
+            setattr(instance, self._storage_name, value)
+
+    @staticmethod
+    def storage_name(prop_name:str) -> str:
+        """Name the slot that stores the value of a property for instances without a __dict__.
+
+        The name is mangled like a private attribute of BaseValidator, so it cannot collide with
+        attributes of the class owning the property, such as '_' + the property name.
+
+        Args:
+            prop_name (str): Name of the property.
+
+        Returns:
+            str: Name of the slot.
+        """
+        return '_BaseValidator__' + prop_name
 
     def validate(self, name, value):
         self.validate_exists(name, value)
         return value
 
+    def build_fast_validate(self):
+        """Build a function that validates values like self.validate, specialized for this validator.
+
+        Subclasses can return a function that checks the common, valid case inline with the validator's
+        settings bound as local variables, and only calls self.validate for anything else, so that
+        exceptions stay the same. Such a function only applies as long as validate is not overridden by
+        a further subclass, otherwise self.validate has to be returned.
+
+        Returns:
+            Callable[[str, Any], Any]: Function taking a property name and value and returning the value to store.
+        """
+        return self.validate
+
     @staticmethod
     def validate_exists(name, value):
         if value is None:
@@ -52,7 +217,7 @@ class BaseValidator:
 
 class StringValidator(BaseValidator):
 
-    def __init__(self, min_length:int=0, max_length:int=None, valid_characters:Sequence=None) -> None:
+    def __init__(self, min_length:int=0, max_length:int=None, valid_characters:Collection=None) -> None:
         super().__init__()
 
         for v in (min_length, max_length):
@@ -62,8 +227,8 @@ class StringValidator(BaseValidator):
         self.min_length = min_length
         self.max_length = max_length
 
-        self.validate_type('valid_characters', valid_characters, desired_types=(Sequence, type(None)))
-        self.valid_characters = valid_characters
+        self.validate_type('valid_characters', valid_characters, desired_types=(Collection, type(None)))
+        self.valid_characters = frozenset(valid_characters) if valid_characters is not None else None
     
     def validate(self, name, value):
         value = super().validate(name, value)
@@ -72,12 +237,38 @@ class StringValidator(BaseValidator):
         self.validate_chars(name, value, valid_chars=self.valid_characters)
         return value
 
+    def build_fast_validate(self):
+        if type(self).validate is not StringValidator.validate:
+            return self.validate
+        min_length, max_length, valid_chars = self.min_length, self.max_length, self.valid_characters
+        if valid_chars is not None:
+            valid_chars = frozenset(valid_chars)
+        valid_ascii = valid_ascii_bytes(valid_chars) if valid_chars is not None else None
+        validate = self.validate
+
+        def fast_validate(name, value):
+            if isinstance(value, str):
+                length = len(value)
+                if ((min_length is None or length >= min_length) and (max_length is None or length <= max_length)
+                        and (valid_chars is None
+                             or (not value.encode('ascii').translate(None, valid_ascii) if length >= TRANSLATE_MIN_LEN and value.isascii()
+                                 else valid_chars.issuperset(value)))):
+                    return value
+            return validate(name, value)
+        return fast_validate
+
     @staticmethod
     def validate_chars(name, value, valid_chars):
         if valid_chars is not None:
-            for char in value:
-                if char not in valid_chars:
-                    raise ValueError(f"{name} contains invalid character '{char}'")
+            valid_chars = frozenset(valid_chars)
+            # Valid values pass with set lookups or a translate alone, the pattern only locates the first invalid character.
+            if len(value) >= TRANSLATE_MIN_LEN and value.isascii():
+                valid = not value.encode('ascii').translate(None, valid_ascii_bytes(valid_chars))
+            else:
+                valid = valid_chars.issuperset(value)
+            if not valid:
+                match = invalid_chars_pattern(valid_chars).search(value)
+                raise ValueError(f"{name} contains invalid character '{match.group()}'")
 
 
 class IntValidator(BaseValidator):
@@ -98,6 +289,18 @@ class IntValidator(BaseValidator):
         self.validate_bounds(name, value, lower=self.min_value, upper=self.max_value)
         return value
 
+    def build_fast_validate(self):
+        if type(self).validate is not IntValidator.validate:
+            return self.validate
+        min_value, max_value = self.min_value, self.max_value
+        validate = self.validate
+
+        def fast_validate(name, value):
+            if isinstance(value, int) and (min_value is None or value >= min_value) and (max_value is None or value <= max_value):
+                return value
+            return validate(name, value)
+        return fast_validate
+
 
 class DateValidator(BaseValidator):
     
@@ -106,6 +309,10 @@ class DateValidator(BaseValidator):
         if formats is not None:
             for fmt in formats:
                 self.validate_type('format', fmt, desired_types=str)
+            # Compile the patterns up front, so the first dates to validate do not pay for it.
+            context = _time_context()
+            for fmt in formats:
+                _format_regex(fmt, context)
         self.formats = formats
 
         for date in (earliest, latest):
@@ -128,9 +335,18 @@ class DateValidator(BaseValidator):
 
     @staticmethod
     def str_to_datetime(date:str, formats:tuple[str, ...]) -> datetime:
-        for fmt in formats:
-            try:
-                return datetime.strptime(date, fmt)
-            except ValueError:
-                pass
-        raise ValueError(f"Date {date} does not match any of the specified formats {formats}")
\ No newline at end of file
+        """Convert a string to a datetime using the first of the formats it matches.
+
+        Results are cached, so parsing the same string with the same formats again is a lookup.
+
+        Args:
+            date (str): The date to convert.
+            formats (tuple[str, ...]): strptime formats to try, in order.
+
+        Raises:
+            ValueError: If date does not match any of the formats.
+
+        Returns:
+            datetime: The parsed date.
+        """
+        return _parse_date(date, tuple(formats), _time_context())
\ No newline at end of file